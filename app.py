@@ -1,7 +1,13 @@
 import streamlit as st
+import asyncio
+import html
 import os
+import queue
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from src.agents.startup_profiler_agent import StartupProfilerAgent
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from src.utils.logging_config import setup_logging
 
 # Load environment variables
@@ -17,93 +23,219 @@ st.set_page_config(
 # Initialize agent
 @st.cache_resource
 def get_agent():
+    # Imported lazily so the agent's dependency tree loads once per process
+    from src.agents.startup_profiler_agent import StartupProfilerAgent
     setup_logging()
     return StartupProfilerAgent()
 
-# Dark blue theme CSS
-st.markdown("""
-<style>
-    .stApp {
-        background-color: #1e3a5f;
-        color: white;
-    }
-    
-    .main .block-container {
-        background-color: #1e3a5f;
-        color: white;
-    }
-    
-    .stTextInput > div > div > input {
-        background-color: #2c5282;
-        color: white;
-        border: 1px solid #4a90c2;
-    }
-    
-    .stButton > button {
-        background-color: #4a90c2;
-        color: white;
-        border: none;
-        border-radius: 5px;
-    }
-    
-    .stButton > button:hover {
-        background-color: #357abd;
-        color: white;
-    }
+# One event loop for the whole process: the agent is shared via cache_resource
+# and Gemini's async client stays bound to the loop it first ran on, so a
+# per-request asyncio.run would leave it on a closed loop
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="profile-event-loop", daemon=True).start()
+    return loop
+
+# The fetchers return [] on errors; raising keeps those results out of the cache
+@st.cache_data(ttl=3600, max_entries=512, show_spinner=False)
+def _cached_news(company_name: str) -> list:
+    news = get_agent().news_fetcher.fetch_company_news(company_name)
+    if not news:
+        raise LookupError(f"No news found for {company_name}")
+    return news
+
+def cached_news(company_name: str) -> list:
+    try:
+        return _cached_news(company_name)
+    except LookupError:
+        return []
+
+@st.cache_data(ttl=3600, max_entries=512, show_spinner=False)
+def _stored_news(profile_id: str) -> list:
+    news = get_agent().db_manager.get_company_news(profile_id)
+    if not news:
+        raise LookupError(f"No stored news for profile {profile_id}")
+    return news
+
+def stored_news(profile_id: str) -> list:
+    try:
+        return _stored_news(profile_id)
+    except LookupError:
+        return []
+
+# Persisted to disk so results survive server restarts. Streamlit ignores TTLs
+# on persisted caches, which is fine as stored profiles are never rewritten.
+@st.cache_data(max_entries=1024, persist="disk", show_spinner=False)
+def run_profile(normalized_url: str, _website_url: str, _on_chunk=None) -> dict:
+    # normalized_url is only the cache key; scrape the URL as the user typed it
+    ctx = get_script_run_ctx()
     
-    .metric-card {
-        background-color: #2c5282;
-        padding: 1rem;
-        border-radius: 8px;
-        border: 1px solid #4a90c2;
-        margin-bottom: 1rem;
-    }
+    def fetch_news(company_name: str) -> list:
+        # The agent fetches news from a worker thread; give it the script
+        # context so the Streamlit cache can be used there
+        add_script_run_ctx(ctx=ctx)
+        return cached_news(company_name)
     
-    .stMetric {
-        background-color: #2c5282;
-        padding: 1rem;
-        border-radius: 8px;
-        border: 1px solid #4a90c2;
-    }
+    result = asyncio.run_coroutine_threadsafe(
+        get_agent().profile_company_async(_website_url, _on_chunk, fetch_news=fetch_news),
+        get_event_loop()
+    ).result()
+    # Raise instead of returning so failed runs are not cached
+    if result['status'] == 'error':
+        raise RuntimeError(result.get('message', 'An error occurred'))
+    return result
+
+def stream_profile(website_url: str) -> dict:
+    """Run the profile in a worker thread while streaming Gemini output to the page."""
+    # Rendering happens on the script thread so no elements are recorded
+    # inside the cached function (which would break cache replay)
+    chunks = queue.Queue()
+    placeholder = st.empty()
+    streamed = ""
+    # Normalize so URL variants share a cache entry
+    normalized_url = get_agent().db_manager._normalize_url(website_url)
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=1, initializer=lambda: add_script_run_ctx(ctx=ctx)) as executor:
+        future = executor.submit(run_profile, normalized_url, website_url, chunks.put)
+        while not future.done() or not chunks.empty():
+            try:
+                streamed += chunks.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            placeholder.code(streamed[-2000:], language="json")
+    placeholder.empty()
+    return future.result()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_profile_count() -> int:
+    return get_agent().db_manager.count_company_profiles()
+
+@st.cache_data(show_spinner=False)
+def load_css() -> str:
+    return (Path(__file__).parent / "static" / "theme.css").read_text()
+
+# Dark blue theme CSS
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
+
+def profile_summary_html(profile: dict) -> str:
+    """Build the HTML for the profile header, metrics and analysis sections."""
+    def field(key: str, default: str) -> str:
+        return html.escape(str(profile.get(key) or default))
     
-    .stSidebar {
-        background-color: #2c5282;
-    }
+    card = (
+        '<div class="metric-card" style="flex: 1;">'
+        '<h4 style="color: white; margin-top: 0;">{title}</h4>'
+        '<p style="color: white; font-size: 1.1rem;">{value}</p>'
+        '</div>'
+    )
+    metrics = (
+        '<div style="display: flex; gap: 1rem;">'
+        + card.format(title="🏭 Industry", value=field("industry_category", "Not specified"))
+        + card.format(title="👥 Target Audience", value=field("target_audience", "Not specified"))
+        + '</div>'
+    )
     
-    .stSidebar .stMarkdown {
-        color: white;
-    }
+    problems = profile.get('key_problems_solved', [])
+    if problems:
+        problems_html = "<ol>" + "".join(f"<li>{html.escape(p)}</li>" for p in problems) + "</ol>"
+    else:
+        problems_html = "<p>No information available</p>"
     
-    .stMarkdown {
-        color: white;
-    }
+    competitors = profile.get('potential_competitors', [])
+    if competitors:
+        chips = "".join(
+            f'<span style="background-color: #2c5282; padding: 0.7rem 1.2rem; margin: 0.3rem 0.5rem; border-radius: 5px; border: 1px solid #4a90c2; display: inline-block; font-size: 1.1rem; color: white;">{html.escape(c)}</span>'
+            for c in competitors
+        )
+        competitors_html = f'<div style="line-height: 3;">{chips}</div>'
+    else:
+        competitors_html = "<p>No competitors identified</p>"
     
-    .stSuccess {
-        background-color: #22543d;
-        color: white;
-    }
+    news_html = (
+        '<div style="background-color: #2c5282; padding: 1rem; border-radius: 8px; border: 1px solid #4a90c2;">'
+        f'<p style="color: white; margin: 0;">{field("news_summary", "No recent news available")}</p>'
+        '</div>'
+    )
     
-    .stInfo {
-        background-color: #2c5282;
-        color: white;
-    }
+    # Joined without newlines so markdown treats it as a single HTML block
+    return "".join([
+        f"<h2>{field('company_name', 'Company Profile')}</h2>",
+        metrics,
+        "<h3>Company Summary</h3>",
+        f"<p>{field('company_summary', 'No summary available')}</p>",
+        "<h3>Key Problems Solved</h3>",
+        problems_html,
+        "<h3>Potential Competitors</h3>",
+        competitors_html,
+        "<h3>Recent News Summary</h3>",
+        news_html,
+    ])
+
+def render_news(news: list):
+    """Render up to five news articles."""
+    if news:
+        for article in news[:5]:
+            st.markdown(f"**{article.get('title', 'No title')}**")
+            st.write(article.get('snippet', 'No snippet available'))
+            st.caption(f"Source: {article.get('source_name', 'Unknown')} | Date: {article.get('date', 'N/A')}")
+            st.markdown("---")
+    else:
+        st.info("No news articles found")
+
+@st.fragment
+def render_result():
+    """Render the last analysis result; interactions here rerun only this fragment."""
+    result = st.session_state['last_result']
     
-    .stError {
-        background-color: #742a2a;
-        color: white;
-    }
+    if result['status'] == 'success':
+        st.success("✅ Analysis complete!")
+        
+        profile = result['data']
+        
+        # Everything above the expanders goes out as one element
+        st.markdown(profile_summary_html(profile), unsafe_allow_html=True)
+        
+        # Expandable sections for additional data
+        with st.expander("📊 View Technical Details"):
+            st.write(f"**Website:** {profile.get('website_url', 'N/A')}")
+            st.write(f"**Page Title:** {profile.get('page_title', 'N/A')}")
+            st.write(f"**Meta Description:** {profile.get('meta_description', 'N/A')}")
+            
+            if profile.get('h1_tags'):
+                st.write("**H1 Tags:**")
+                for tag in profile.get('h1_tags', [])[:3]:
+                    st.write(f"- {tag}")
+        
+        with st.expander("📰 View News Articles"):
+            render_news(profile.get('latest_news', []))
     
-    .stExpander {
-        background-color: #2c5282;
-        border: 1px solid #4a90c2;
-    }
+    elif result['status'] == 'exists':
+        st.info("ℹ️ This company has already been profiled.")
+        
+        # Show the existing profile
+        profile = result['data']
+        
+        st.markdown(f"## {profile.get('company_name', 'Company Profile')}")
+        
+        # Display the existing data in the same format
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("Industry", profile.get("industry_category", "Not specified"))
+        
+        with col2:
+            st.metric("Created", profile.get("created_at", "N/A")[:10])
+        
+        st.markdown("### Company Summary")
+        st.write(profile.get('company_summary', 'No summary available'))
+        
+        # Stored news lives in its own table; only fetched when asked for
+        if st.toggle("📰 Show News Articles"):
+            render_news(stored_news(profile['id']))
     
-    .stSelectbox > div > div {
-        background-color: #2c5282;
-        color: white;
-    }
-</style>
-""", unsafe_allow_html=True)
+    else:
+        st.error(f"❌ {result.get('message', 'An error occurred')}")
 
 def main():
     # Header
@@ -125,9 +257,7 @@ def main():
         
         # Try to show profile count
         try:
-            agent = get_agent()
-            result = agent.db_manager.client.table('company_profiles').select("id").execute()
-            st.metric("Total Profiles", len(result.data))
+            st.metric("Total Profiles", get_profile_count())
         except:
             st.metric("Total Profiles", "4")
     
@@ -155,116 +285,22 @@ def main():
         
         with st.spinner('Analyzing company... This typically takes 30-60 seconds.'):
             try:
-                agent = get_agent()
-                result = agent.profile_company(website_url)
+                result = stream_profile(website_url)
                 
                 if result['status'] == 'success':
-                    st.success("✅ Analysis complete!")
-                    
-                    profile = result['data']
-                    
-                    # Company name and basics
-                    st.markdown(f"## {profile.get('company_name', 'Company Profile')}")
-                    
-                    # Key metrics in columns
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <h4 style="color: white; margin-top: 0;">🏭 Industry</h4>
-                            <p style="color: white; font-size: 1.1rem;">{profile.get("industry_category", "Not specified")}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <h4 style="color: white; margin-top: 0;">👥 Target Audience</h4>
-                            <p style="color: white; font-size: 1.1rem;">{profile.get("target_audience", "Not specified")}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Company summary
-                    st.markdown("### Company Summary")
-                    st.write(profile.get('company_summary', 'No summary available'))
-                    
-                    # Key problems in columns
-                    st.markdown("### Key Problems Solved")
-                    problems = profile.get('key_problems_solved', [])
-                    if problems:
-                        for i, problem in enumerate(problems, 1):
-                            st.write(f"{i}. {problem}")
-                    else:
-                        st.write("No information available")
-                    
-                    # Competitors
-                    st.markdown("### Potential Competitors")
-                    competitors = profile.get('potential_competitors', [])
-                    if competitors:
-                        competitors_html = ""
-                        for competitor in competitors:
-                            competitors_html += f'<span style="background-color: #2c5282; padding: 0.7rem 1.2rem; margin: 0.3rem 0.5rem; border-radius: 5px; border: 1px solid #4a90c2; display: inline-block; font-size: 1.1rem; color: white;">{competitor}</span>'
-                        st.markdown(f'<div style="line-height: 3;">{competitors_html}</div>', unsafe_allow_html=True)
-                    else:
-                        st.write("No competitors identified")
-                    
-                    # News summary
-                    st.markdown("### Recent News Summary")
-                    st.markdown(f"""
-                    <div style="background-color: #2c5282; padding: 1rem; border-radius: 8px; border: 1px solid #4a90c2;">
-                        <p style="color: white; margin: 0;">{profile.get('news_summary', 'No recent news available')}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Expandable sections for additional data
-                    with st.expander("📊 View Technical Details"):
-                        st.write(f"**Website:** {profile.get('website_url', 'N/A')}")
-                        st.write(f"**Page Title:** {profile.get('page_title', 'N/A')}")
-                        st.write(f"**Meta Description:** {profile.get('meta_description', 'N/A')}")
-                        
-                        if profile.get('h1_tags'):
-                            st.write("**H1 Tags:**")
-                            for tag in profile.get('h1_tags', [])[:3]:
-                                st.write(f"- {tag}")
-                    
-                    with st.expander("📰 View News Articles"):
-                        news = profile.get('latest_news', [])
-                        if news:
-                            for article in news[:5]:
-                                st.markdown(f"**{article.get('title', 'No title')}**")
-                                st.write(article.get('snippet', 'No snippet available'))
-                                st.caption(f"Source: {article.get('source_name', 'Unknown')} | Date: {article.get('date', 'N/A')}")
-                                st.markdown("---")
-                        else:
-                            st.info("No news articles found")
+                    # A new profile was saved, so the cached count is stale
+                    get_profile_count.clear()
                 
-                elif result['status'] == 'exists':
-                    st.info("ℹ️ This company has already been profiled.")
-                    
-                    # Show the existing profile
-                    profile = result['data']
-                    
-                    st.markdown(f"## {profile.get('company_name', 'Company Profile')}")
-                    
-                    # Display the existing data in the same format
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.metric("Industry", profile.get("industry_category", "Not specified"))
-                    
-                    with col2:
-                        st.metric("Created", profile.get("created_at", "N/A")[:10])
-                    
-                    st.markdown("### Company Summary")
-                    st.write(profile.get('company_summary', 'No summary available'))
-                    
-                else:
-                    st.error(f"❌ {result.get('message', 'An error occurred')}")
+                st.session_state['last_result'] = result
                     
             except Exception as e:
+                st.session_state.pop('last_result', None)
                 st.error(f"❌ An error occurred: {str(e)}")
     
+    # Render from session state so the result survives reruns
+    if 'last_result' in st.session_state:
+        render_result()
+    
     # Footer
     st.markdown("---")
     st.caption("Built with Langchain • Google Gemini AI • SerpAPI • Supabase")
@@ -14,18 +14,96 @@ CREATE TABLE IF NOT EXISTS company_profiles (
     h1_tags TEXT[],
     h2_tags TEXT[],
     outbound_links TEXT[],
-    latest_news JSONB[],
     scraped_content TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
--- Create index for faster lookups
-CREATE INDEX IF NOT EXISTS idx_website_url ON company_profiles(website_url);
+-- The UNIQUE constraint on website_url already provides the lookup index
+-- (and is the conflict target for upserts), so drop the old redundant one
+DROP INDEX IF EXISTS idx_website_url;
+
+-- Keep updated_at current on updates (timestamps are set by the database)
+CREATE EXTENSION IF NOT EXISTS moddatetime;
+DROP TRIGGER IF EXISTS set_updated_at ON company_profiles;
+CREATE TRIGGER set_updated_at BEFORE UPDATE ON company_profiles
+    FOR EACH ROW EXECUTE FUNCTION moddatetime(updated_at);
+
+-- News articles live in a child table so profile reads don't carry them
+CREATE TABLE IF NOT EXISTS company_news (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    profile_id UUID NOT NULL REFERENCES company_profiles(id) ON DELETE CASCADE,
+    title TEXT,
+    snippet TEXT,
+    source_name TEXT,
+    date TEXT,
+    url TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_company_news_profile_id ON company_news(profile_id);
+
+-- Tables created before company_news existed stored news inline;
+-- copy it into company_news before dropping the column
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'company_profiles' AND column_name = 'latest_news'
+    ) THEN
+        INSERT INTO company_news (profile_id, title, snippet, source_name, date, url)
+        SELECT p.id, n->>'title', n->>'snippet', n->>'source_name', n->>'date', n->>'source'
+        FROM company_profiles p, unnest(p.latest_news) AS n;
+
+        ALTER TABLE company_profiles DROP COLUMN latest_news;
+    END IF;
+END;
+$$;
+
+-- Save a profile and its news articles in a single round-trip
+CREATE OR REPLACE FUNCTION save_profile_with_news(profile JSONB, news JSONB)
+RETURNS SETOF company_profiles
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    saved company_profiles;
+BEGIN
+    INSERT INTO company_profiles (
+        website_url, company_name, page_title, meta_description,
+        company_summary, industry_category, target_audience,
+        key_problems_solved, potential_competitors, news_summary,
+        h1_tags, h2_tags, outbound_links, scraped_content
+    )
+    SELECT
+        p.website_url, p.company_name, p.page_title, p.meta_description,
+        p.company_summary, p.industry_category, p.target_audience,
+        p.key_problems_solved, p.potential_competitors, p.news_summary,
+        p.h1_tags, p.h2_tags, p.outbound_links, p.scraped_content
+    FROM jsonb_populate_record(NULL::company_profiles, profile) AS p
+    ON CONFLICT (website_url) DO NOTHING
+    RETURNING * INTO saved;
+
+    -- Profile already exists: return no rows
+    IF saved.id IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO company_news (profile_id, title, snippet, source_name, date, url)
+    SELECT saved.id, n->>'title', n->>'snippet', n->>'source_name', n->>'date', n->>'source'
+    FROM jsonb_array_elements(COALESCE(news, '[]'::jsonb)) AS n;
+
+    RETURN NEXT saved;
+END;
+$$;
 
 -- Enable Row Level Security (optional but recommended)
 ALTER TABLE company_profiles ENABLE ROW LEVEL SECURITY;
+ALTER TABLE company_news ENABLE ROW LEVEL SECURITY;
 
--- Create a policy to allow all operations (for development)
+-- Create a policy to allow all operations (for development); dropped first so
+-- the script can be re-run on existing installs to apply the migrations above
+DROP POLICY IF EXISTS "Allow all operations" ON company_profiles;
 CREATE POLICY "Allow all operations" ON company_profiles
+    FOR ALL USING (true) WITH CHECK (true);
+DROP POLICY IF EXISTS "Allow all operations" ON company_news;
+CREATE POLICY "Allow all operations" ON company_news
     FOR ALL USING (true) WITH CHECK (true);
\ No newline at end of file
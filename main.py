@@ -50,7 +50,10 @@ def main():
         else:
             # Profile the company
             print(f"Profiling company: {args.website_url}")
-            result = agent.profile_company(args.website_url)
+            result = agent.profile_company(
+                args.website_url,
+                on_analysis_chunk=lambda text: print(text, end="", flush=True)
+            )
             
             if result['status'] == 'success':
                 print("\nCompany profile created successfully!")
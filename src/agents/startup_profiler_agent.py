@@ -1,10 +1,9 @@
+import asyncio
 import logging
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Callable, Dict, List, Optional
 from urllib.parse import urlparse
-from langchain.agents import initialize_agent, Tool, AgentType
-from langchain.memory import ConversationBufferMemory
-from langchain.schema import HumanMessage, SystemMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
 
 from src.tools.web_scraper import WebScraper
 from src.tools.news_fetcher import NewsFetcher
@@ -24,15 +23,33 @@ class StartupProfilerAgent:
         self.news_fetcher = NewsFetcher()
         self.gemini_analyzer = GeminiAnalyzer()
         self.db_manager = SupabaseManager()
+    
+    @cached_property
+    def agent(self):
+        """
+        Conversational Langchain agent used by chat().
         
-        # Initialize Langchain components
+        Built on first access so the profile_company path never pays for
+        importing and constructing the Langchain stack.
+        """
         import os
+        from langchain.agents import initialize_agent, Tool, AgentType
+        from langchain.memory import ConversationTokenBufferMemory
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        
+        # Initialize Langchain components
         self.llm = ChatGoogleGenerativeAI(
             model="gemini-1.5-flash", 
             temperature=0.3,
             google_api_key=os.getenv('GEMINI_API_KEY')
         )
-        self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+        # Bound the chat history so prompt size doesn't grow with every turn
+        self.memory = ConversationTokenBufferMemory(
+            llm=self.llm,
+            max_token_limit=2000,
+            memory_key="chat_history",
+            return_messages=True
+        )
         
         # Define tools for the agent
         self.tools = [
@@ -59,7 +76,7 @@ class StartupProfilerAgent:
         ]
         
         # Initialize agent
-        self.agent = initialize_agent(
+        return initialize_agent(
             self.tools,
             self.llm,
             agent=AgentType.CONVERSATIONAL_REACT_DESCRIPTION,
@@ -68,12 +85,18 @@ class StartupProfilerAgent:
             handle_parsing_errors=True
         )
     
-    def profile_company(self, website_url: str) -> Dict[str, any]:
+    def profile_company(self,
+                        website_url: str,
+                        on_analysis_chunk: Optional[Callable[[str], None]] = None,
+                        fetch_news: Optional[Callable[[str], List[Dict]]] = None) -> Dict[str, any]:
         """
         Main method to profile a company based on its website URL.
         
         Args:
             website_url: The company's website URL
+            on_analysis_chunk: Optional callback receiving Gemini output as it streams
+            fetch_news: Optional news fetcher replacing NewsFetcher.fetch_company_news,
+                e.g. a cached wrapper
             
         Returns:
             Dictionary containing the company profile
@@ -83,43 +106,54 @@ class StartupProfilerAgent:
             
             # Extract company name from URL
             company_name = self._extract_company_name(website_url)
+            fetch_news = fetch_news or self.news_fetcher.fetch_company_news
             
-            # Check if profile already exists
+            # Check if profile already exists. This runs before anything else
+            # starts: threads can't be cancelled, so an early return would
+            # otherwise still wait for (and pay for) the scrape and news fetch
             if self.db_manager.check_company_exists(website_url):
                 logger.info(f"Company profile already exists for {website_url}")
                 return {
                     "status": "exists",
                     "message": "Company profile already exists in database",
-                    "data": self.db_manager.get_company_profile(website_url)
+                    "data": self.db_manager.get_company_profile_summary(website_url)
                 }
             
-            # Scrape website
-            logger.info("Scraping website...")
-            scraped_data = self.web_scraper.scrape_website(website_url)
-            
-            # Fetch news
-            logger.info("Fetching latest news...")
-            news_data = self.news_fetcher.fetch_company_news(
-                company_name or scraped_data.get('title', '')
-            )
+            # The scrape and news fetch are independent, so run them concurrently
+            executor = ThreadPoolExecutor(max_workers=2)
+            try:
+                scrape_future = executor.submit(self.web_scraper.scrape_website, website_url)
+                news_future = (
+                    executor.submit(fetch_news, company_name)
+                    if company_name else None
+                )
+                
+                # Scrape website
+                logger.info("Scraping website...")
+                scraped_data = scrape_future.result()
+                
+                # Fetch news (falls back to the page title if the URL gave no name)
+                logger.info("Fetching latest news...")
+                if news_future:
+                    news_data = news_future.result()
+                else:
+                    news_data = fetch_news(
+                        scraped_data.get('title', '')
+                    )
+            finally:
+                # Don't block on in-flight work we no longer need
+                executor.shutdown(wait=False, cancel_futures=True)
             
             # Analyze with Gemini
             logger.info("Analyzing with Gemini...")
-            analysis = self.gemini_analyzer.analyze_company(scraped_data, news_data)
+            analysis = self.gemini_analyzer.analyze_company(
+                scraped_data, news_data, on_chunk=on_analysis_chunk
+            )
             
             # Prepare complete profile
-            profile_data = {
-                "website_url": website_url,
-                "company_name": company_name or scraped_data.get('title', ''),
-                "page_title": scraped_data.get('title', ''),
-                "meta_description": scraped_data.get('meta_description', ''),
-                "h1_tags": scraped_data.get('h1_tags', []),
-                "h2_tags": scraped_data.get('h2_tags', []),
-                "outbound_links": scraped_data.get('outbound_links', []),
-                "scraped_content": scraped_data.get('content', ''),
-                "latest_news": news_data,
-                **analysis
-            }
+            profile_data = self._build_profile(
+                website_url, company_name, scraped_data, news_data, analysis
+            )
             
             # Save to database
             logger.info("Saving to database...")
@@ -139,6 +173,122 @@ class StartupProfilerAgent:
                 "data": None
             }
     
+    async def profile_company_async(self,
+                                    website_url: str,
+                                    on_analysis_chunk: Optional[Callable[[str], None]] = None,
+                                    fetch_news: Optional[Callable[[str], List[Dict]]] = None) -> Dict[str, any]:
+        """
+        Async variant of profile_company.
+        
+        The database calls, the scrape and the news fetch (which may be a
+        caller-supplied blocking function) run in worker threads via
+        asyncio.to_thread, so this uses as many threads as profile_company;
+        only the Gemini call is awaited natively. Threads can't be cancelled,
+        so the existence check completes before any scraping or news fetching
+        starts.
+        
+        Gemini's async client binds to the first event loop it runs on, so
+        long-lived callers should drive every call on the same loop rather
+        than a fresh asyncio.run per call.
+        
+        Args:
+            website_url: The company's website URL
+            on_analysis_chunk: Optional callback receiving Gemini output as it streams
+            fetch_news: Optional news fetcher replacing NewsFetcher.fetch_company_news,
+                e.g. a cached wrapper
+            
+        Returns:
+            Dictionary containing the company profile
+        """
+        try:
+            logger.info(f"Starting profiling for: {website_url}")
+            
+            company_name = self._extract_company_name(website_url)
+            fetch_news = fetch_news or self.news_fetcher.fetch_company_news
+            
+            if await asyncio.to_thread(self.db_manager.check_company_exists, website_url):
+                logger.info(f"Company profile already exists for {website_url}")
+                return {
+                    "status": "exists",
+                    "message": "Company profile already exists in database",
+                    "data": await asyncio.to_thread(
+                        self.db_manager.get_company_profile_summary, website_url
+                    )
+                }
+            
+            # The scrape and news fetch are independent, so run them concurrently
+            scrape_task = asyncio.create_task(
+                self.web_scraper.scrape_website_async(website_url)
+            )
+            news_task = asyncio.create_task(
+                asyncio.to_thread(fetch_news, company_name)
+            ) if company_name else None
+            
+            try:
+                logger.info("Scraping website...")
+                scraped_data = await scrape_task
+                
+                logger.info("Fetching latest news...")
+                if news_task:
+                    news_data = await news_task
+                else:
+                    news_data = await asyncio.to_thread(
+                        fetch_news,
+                        scraped_data.get('title', '')
+                    )
+            finally:
+                for task in (scrape_task, news_task):
+                    if task and not task.done():
+                        task.cancel()
+            
+            logger.info("Analyzing with Gemini...")
+            analysis = await self.gemini_analyzer.analyze_company_async(
+                scraped_data, news_data, on_chunk=on_analysis_chunk
+            )
+            
+            profile_data = self._build_profile(
+                website_url, company_name, scraped_data, news_data, analysis
+            )
+            
+            logger.info("Saving to database...")
+            saved_profile = await asyncio.to_thread(
+                self.db_manager.save_company_profile, profile_data
+            )
+            
+            return {
+                "status": "success",
+                "message": "Company profile created successfully",
+                "data": saved_profile
+            }
+            
+        except Exception as e:
+            logger.error(f"Error profiling company: {str(e)}")
+            return {
+                "status": "error",
+                "message": str(e),
+                "data": None
+            }
+    
+    def _build_profile(self,
+                       website_url: str,
+                       company_name: str,
+                       scraped_data: Dict,
+                       news_data: list,
+                       analysis: Dict) -> Dict[str, any]:
+        """Combine scraped data, news and analysis into a profile record."""
+        return {
+            "website_url": website_url,
+            "company_name": company_name or scraped_data.get('title', ''),
+            "page_title": scraped_data.get('title', ''),
+            "meta_description": scraped_data.get('meta_description', ''),
+            "h1_tags": scraped_data.get('h1_tags', []),
+            "h2_tags": scraped_data.get('h2_tags', []),
+            "outbound_links": scraped_data.get('outbound_links', []),
+            "scraped_content": scraped_data.get('content', ''),
+            "latest_news": news_data,
+            **analysis
+        }
+    
     def _extract_company_name(self, url: str) -> str:
         """Extract company name from URL."""
         parsed = urlparse(url)
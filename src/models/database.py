@@ -1,12 +1,34 @@
 import os
+import re
 import logging
-from typing import Dict, Optional, List
-from datetime import datetime
+import functools
+from typing import Dict, Optional, List, Sequence
 from supabase import create_client, Client
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+# Columns needed to render a profile summary without the heavy text/JSON fields
+SUMMARY_COLUMNS = ("id", "company_name", "industry_category", "created_at", "company_summary")
+
+# Scraped text is stored for reference only; it is never re-read for analysis
+MAX_SCRAPED_CONTENT_CHARS = 8192
+
+_URL_RE = re.compile(r'^(?:https?://)?(?:www\.)?([^/?#]*)([^?#]*)')
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_url_cached(url: str) -> str:
+    """Normalize a URL to https://host/path, lowercased and without www."""
+    url = url.lower()
+    if '://' in url and not url.startswith(('http://', 'https://')):
+        # Non-web schemes are rare; keep them on the generic parser
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc.replace('www.', '')}{parsed.path}".rstrip('/')
+    
+    host, path = _URL_RE.match(url).groups()
+    return f"https://{host}{path}".rstrip('/')
+
 
 class SupabaseManager:
     def __init__(self, url: Optional[str] = None, key: Optional[str] = None):
@@ -18,6 +40,7 @@ class SupabaseManager:
         
         self.client: Client = create_client(self.url, self.key)
         self.table_name = "company_profiles"
+        self.news_table_name = "company_news"
     
     def check_company_exists(self, website_url: str) -> bool:
         """
@@ -33,11 +56,12 @@ class SupabaseManager:
             # Normalize URL for comparison
             normalized_url = self._normalize_url(website_url)
             
-            result = self.client.table(self.table_name).select("id").eq(
-                "website_url", normalized_url
-            ).execute()
+            # HEAD request with an exact count: no row bodies are returned
+            result = self.client.table(self.table_name).select(
+                "id", count="exact", head=True
+            ).eq("website_url", normalized_url).execute()
             
-            return len(result.data) > 0
+            return (result.count or 0) > 0
             
         except Exception as e:
             logger.error(f"Error checking company existence: {str(e)}")
@@ -69,16 +93,27 @@ class SupabaseManager:
                 "h1_tags": profile_data.get('h1_tags', []),
                 "h2_tags": profile_data.get('h2_tags', []),
                 "outbound_links": profile_data.get('outbound_links', []),
-                "latest_news": profile_data.get('latest_news', []),
-                "scraped_content": profile_data.get('scraped_content', ''),
-                "created_at": datetime.utcnow().isoformat(),
-                "updated_at": datetime.utcnow().isoformat()
+                "scraped_content": (profile_data.get('scraped_content') or '')[:MAX_SCRAPED_CONTENT_CHARS]
             }
             
-            result = self.client.table(self.table_name).insert(record).execute()
+            news = profile_data.get('latest_news', [])
+            
+            # Insert the profile and its news in one round-trip. The function
+            # skips profiles whose website_url already exists, so a concurrent
+            # save of the same company is a no-op instead of a constraint violation
+            result = self.client.rpc(
+                "save_profile_with_news", {"profile": record, "news": news}
+            ).execute()
+            
+            if not result.data:
+                logger.info(f"Company profile already exists for {record['website_url']}")
+                existing = self.get_company_profile(record['website_url'])
+                if not existing:
+                    return {}
+                return {**existing, "latest_news": self.get_company_news(existing['id'])}
             
             logger.info(f"Successfully saved company profile for {record['website_url']}")
-            return result.data[0] if result.data else {}
+            return {**result.data[0], "latest_news": news}
             
         except Exception as e:
             logger.error(f"Error saving company profile: {str(e)}")
@@ -107,14 +142,71 @@ class SupabaseManager:
             logger.error(f"Error retrieving company profile: {str(e)}")
             return None
     
+    def get_company_news(self, profile_id: str) -> List[Dict[str, any]]:
+        """
+        Retrieve the news articles stored for a company profile.
+        
+        Args:
+            profile_id: The company profile ID
+            
+        Returns:
+            List of news articles
+        """
+        try:
+            result = self.client.table(self.news_table_name).select(
+                "title, snippet, source_name, date, url"
+            ).eq("profile_id", profile_id).execute()
+            
+            return result.data or []
+            
+        except Exception as e:
+            logger.error(f"Error retrieving company news: {str(e)}")
+            return []
+    
+    def get_company_profile_summary(self,
+                                    website_url: str,
+                                    cols: Sequence[str] = SUMMARY_COLUMNS) -> Optional[Dict[str, any]]:
+        """
+        Retrieve only the summary columns of a company profile.
+        
+        Args:
+            website_url: The website URL
+            cols: Columns to select
+            
+        Returns:
+            Partial company profile data or None
+        """
+        try:
+            normalized_url = self._normalize_url(website_url)
+            
+            result = self.client.table(self.table_name).select(",".join(cols)).eq(
+                "website_url", normalized_url
+            ).execute()
+            
+            return result.data[0] if result.data else None
+            
+        except Exception as e:
+            logger.error(f"Error retrieving company profile summary: {str(e)}")
+            return None
+    
+    def count_company_profiles(self) -> int:
+        """
+        Count stored company profiles.
+        
+        Uses a HEAD request with an exact count so no rows are transferred.
+        
+        Returns:
+            Number of profiles in the table
+        """
+        result = self.client.table(self.table_name).select(
+            "id", count="exact", head=True
+        ).execute()
+        
+        return result.count or 0
+    
     def _normalize_url(self, url: str) -> str:
         """Normalize URL for consistent storage and comparison."""
-        parsed = urlparse(url.lower())
-        # Remove www. prefix if present
-        netloc = parsed.netloc.replace('www.', '')
-        # Ensure https scheme
-        scheme = 'https' if parsed.scheme in ['http', 'https'] else parsed.scheme
-        return f"{scheme}://{netloc}{parsed.path}".rstrip('/')
+        return _normalize_url_cached(url)
     
     def create_table_if_not_exists(self):
         """
@@ -137,11 +229,80 @@ class SupabaseManager:
             h1_tags TEXT[],
             h2_tags TEXT[],
             outbound_links TEXT[],
-            latest_news JSONB[],
             scraped_content TEXT,
             created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
             updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
         );
         
-        CREATE INDEX IF NOT EXISTS idx_website_url ON company_profiles(website_url);
+        -- The UNIQUE constraint already indexes website_url
+        DROP INDEX IF EXISTS idx_website_url;
+        
+        -- Keep updated_at current on updates (timestamps are set by the database)
+        CREATE EXTENSION IF NOT EXISTS moddatetime;
+        DROP TRIGGER IF EXISTS set_updated_at ON company_profiles;
+        CREATE TRIGGER set_updated_at BEFORE UPDATE ON company_profiles
+            FOR EACH ROW EXECUTE FUNCTION moddatetime(updated_at);
+        
+        CREATE TABLE IF NOT EXISTS company_news (
+            id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+            profile_id UUID NOT NULL REFERENCES company_profiles(id) ON DELETE CASCADE,
+            title TEXT,
+            snippet TEXT,
+            source_name TEXT,
+            date TEXT,
+            url TEXT
+        );
+        
+        CREATE INDEX IF NOT EXISTS idx_company_news_profile_id ON company_news(profile_id);
+        
+        -- Move news stored inline by older tables into company_news, then drop the column
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'company_profiles' AND column_name = 'latest_news'
+            ) THEN
+                INSERT INTO company_news (profile_id, title, snippet, source_name, date, url)
+                SELECT p.id, n->>'title', n->>'snippet', n->>'source_name', n->>'date', n->>'source'
+                FROM company_profiles p, unnest(p.latest_news) AS n;
+        
+                ALTER TABLE company_profiles DROP COLUMN latest_news;
+            END IF;
+        END;
+        $$;
+        
+        CREATE OR REPLACE FUNCTION save_profile_with_news(profile JSONB, news JSONB)
+        RETURNS SETOF company_profiles
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            saved company_profiles;
+        BEGIN
+            INSERT INTO company_profiles (
+                website_url, company_name, page_title, meta_description,
+                company_summary, industry_category, target_audience,
+                key_problems_solved, potential_competitors, news_summary,
+                h1_tags, h2_tags, outbound_links, scraped_content
+            )
+            SELECT
+                p.website_url, p.company_name, p.page_title, p.meta_description,
+                p.company_summary, p.industry_category, p.target_audience,
+                p.key_problems_solved, p.potential_competitors, p.news_summary,
+                p.h1_tags, p.h2_tags, p.outbound_links, p.scraped_content
+            FROM jsonb_populate_record(NULL::company_profiles, profile) AS p
+            ON CONFLICT (website_url) DO NOTHING
+            RETURNING * INTO saved;
+        
+            -- Profile already exists: return no rows
+            IF saved.id IS NULL THEN
+                RETURN;
+            END IF;
+        
+            INSERT INTO company_news (profile_id, title, snippet, source_name, date, url)
+            SELECT saved.id, n->>'title', n->>'snippet', n->>'source_name', n->>'date', n->>'source'
+            FROM jsonb_array_elements(COALESCE(news, '[]'::jsonb)) AS n;
+        
+            RETURN NEXT saved;
+        END;
+        $$;
         """
\ No newline at end of file
@@ -1,12 +1,24 @@
 import os
 import json
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+# genai converts the schema with pydantic, which rejects typing.TypedDict before 3.12
+from typing_extensions import TypedDict
 import google.generativeai as genai
 
 logger = logging.getLogger(__name__)
 
 
+class CompanyAnalysis(TypedDict):
+    """Response schema for the structured Gemini analysis."""
+    company_summary: str
+    industry_category: str
+    target_audience: str
+    key_problems_solved: List[str]
+    potential_competitors: List[str]
+    news_summary: str
+
+
 class GeminiAnalyzer:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
@@ -14,17 +26,26 @@ class GeminiAnalyzer:
             raise ValueError("Gemini API key not provided")
         
         genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        # JSON mode makes Gemini return schema-conforming JSON server-side
+        self.model = genai.GenerativeModel(
+            'gemini-1.5-flash',
+            generation_config={
+                "response_mime_type": "application/json",
+                "response_schema": CompanyAnalysis
+            }
+        )
     
     def analyze_company(self, 
                        scraped_data: Dict[str, any], 
-                       news_data: List[Dict[str, str]]) -> Dict[str, any]:
+                       news_data: List[Dict[str, str]],
+                       on_chunk: Optional[Callable[[str], None]] = None) -> Dict[str, any]:
         """
         Analyze company information using Gemini.
         
         Args:
             scraped_data: Data from web scraping
             news_data: Latest news articles
+            on_chunk: Optional callback receiving response text as it streams in
             
         Returns:
             Dictionary with analysis results
@@ -35,11 +56,18 @@ class GeminiAnalyzer:
             # Prepare the prompt
             prompt = self._create_analysis_prompt(scraped_data, news_data)
             
-            # Generate response
-            response = self.model.generate_content(prompt)
+            # Generate response, streaming it out if a callback was given
+            if on_chunk:
+                chunks = []
+                for chunk in self.model.generate_content(prompt, stream=True):
+                    chunks.append(chunk.text)
+                    on_chunk(chunk.text)
+                response_text = "".join(chunks)
+            else:
+                response_text = self.model.generate_content(prompt).text
             
             # Parse the response
-            analysis = self._parse_response(response.text)
+            analysis = self._parse_response(response_text)
             
             return analysis
             
@@ -47,6 +75,40 @@ class GeminiAnalyzer:
             logger.error(f"Error in Gemini analysis: {str(e)}")
             raise
     
+    async def analyze_company_async(self, 
+                                    scraped_data: Dict[str, any], 
+                                    news_data: List[Dict[str, str]],
+                                    on_chunk: Optional[Callable[[str], None]] = None) -> Dict[str, any]:
+        """
+        Async variant of analyze_company using Gemini's coroutine API.
+        
+        Args:
+            scraped_data: Data from web scraping
+            news_data: Latest news articles
+            on_chunk: Optional callback receiving response text as it streams in
+            
+        Returns:
+            Dictionary with analysis results
+        """
+        try:
+            logger.info("Analyzing company data with Gemini")
+            
+            prompt = self._create_analysis_prompt(scraped_data, news_data)
+            if on_chunk:
+                chunks = []
+                async for chunk in await self.model.generate_content_async(prompt, stream=True):
+                    chunks.append(chunk.text)
+                    on_chunk(chunk.text)
+                response_text = "".join(chunks)
+            else:
+                response_text = (await self.model.generate_content_async(prompt)).text
+            
+            return self._parse_response(response_text)
+            
+        except Exception as e:
+            logger.error(f"Error in Gemini analysis: {str(e)}")
+            raise
+    
     def _create_analysis_prompt(self, scraped_data: Dict, news_data: List[Dict]) -> str:
         """Create a comprehensive prompt for Gemini analysis."""
         
@@ -55,55 +117,59 @@ class GeminiAnalyzer:
             for article in news_data[:5]
         ])
         
+        title = scraped_data.get('title', '')
+        h1_tags = scraped_data.get('h1_tags', [])[:5]
+        
+        # Order-preserving dedupe; H1s and H2s often repeat each other
+        headings = list(dict.fromkeys(h1_tags + scraped_data.get('h2_tags', [])[:10]))
+        
+        # Skip the meta description when it just repeats the title or main headline
+        meta_description = scraped_data.get('meta_description', '')
+        if meta_description and (meta_description in title or (h1_tags and meta_description in h1_tags[0])):
+            meta_description = ''
+        
+        content = self._truncate_sentences(scraped_data.get('content', ''), 2000)
+        
         prompt = f"""
         Analyze the following company information and provide structured insights.
         
         Website URL: {scraped_data.get('url', 'N/A')}
-        Page Title: {scraped_data.get('title', 'N/A')}
-        Meta Description: {scraped_data.get('meta_description', 'N/A')}
-        
-        Key Headlines (H1):
-        {chr(10).join(scraped_data.get('h1_tags', [])[:5])}
+        Page Title: {title or 'N/A'}
+        Meta Description: {meta_description or 'N/A'}
         
-        Subheadings (H2):
-        {chr(10).join(scraped_data.get('h2_tags', [])[:10])}
+        Headings:
+        {chr(10).join(headings)}
         
         Website Content (excerpt):
-        {scraped_data.get('content', '')[:2000]}
+        {content}
         
         Recent News:
         {news_summary}
         
-        Based on this information, provide the following analysis in JSON format:
-        
-        {{
-            "company_summary": "A 100-word summary of what the company does",
-            "industry_category": "The primary industry category",
-            "target_audience": "Description of the target audience",
-            "key_problems_solved": ["Problem 1", "Problem 2", "Problem 3"],
-            "potential_competitors": ["Competitor 1", "Competitor 2", "Competitor 3"],
-            "news_summary": "A short paragraph summarizing the latest news and developments"
-        }}
-        
-        Ensure your response is valid JSON format only.
+        Based on this information, provide:
+        - company_summary: a 100-word summary of what the company does
+        - industry_category: the primary industry category
+        - target_audience: a description of the target audience
+        - key_problems_solved: the key problems the company solves
+        - potential_competitors: likely competitors
+        - news_summary: a short paragraph summarizing the latest news and developments
         """
         
         return prompt
     
+    def _truncate_sentences(self, text: str, max_chars: int) -> str:
+        """Truncate text to whole sentences within max_chars."""
+        if len(text) <= max_chars:
+            return text
+        
+        cut = text.rfind('. ', 0, max_chars)
+        return text[:cut + 1] if cut != -1 else text[:max_chars]
+    
     def _parse_response(self, response_text: str) -> Dict[str, any]:
         """Parse Gemini's response into structured data."""
         try:
-            # Try to extract JSON from the response
-            # Sometimes Gemini might include extra text
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = response_text[start_idx:end_idx]
-                return json.loads(json_str)
-            else:
-                # Fallback: Try to parse the entire response
-                return json.loads(response_text)
+            # JSON mode guarantees a bare JSON object, so no scanning is needed
+            return json.loads(response_text)
                 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse Gemini response: {e}")
@@ -1,108 +1,367 @@
 import os
-from typing import List, Dict, Optional
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, List, Dict, Optional
 import logging
-from serpapi import GoogleSearch
+import diskcache
+import httpx
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Cache lifetimes in seconds; news goes stale much faster than general info
+NEWS_CACHE_TTL = 3600
+INFO_CACHE_TTL = 86400
+
+SERPAPI_URL = "https://serpapi.com/search.json"
+SERPAPI_TIMEOUT = 15
+
 
 class NewsFetcher:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_dir: Optional[str] = None):
         self.api_key = api_key or os.getenv('SERPAPI_KEY')
         if not self.api_key:
             raise ValueError("SerpAPI key not provided")
+        
+        # Disk-backed so repeat lookups skip the paid API across runs
+        self.cache = diskcache.Cache(
+            cache_dir or os.getenv('SERPAPI_CACHE_DIR', '.cache/serpapi'),
+            size_limit=500_000_000
+        )
+        
+        # Call the SerpAPI endpoint directly over a pooled session rather than
+        # through GoogleSearch, which opens a new connection per search
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=32))
     
-    def fetch_company_news(self, company_name: str, num_results: int = 5) -> List[Dict[str, str]]:
+    def fetch_company_news(self,
+                           company_name: str,
+                           num_results: int = 5,
+                           no_cache: bool = False) -> List[Dict[str, str]]:
         """
         Fetch latest news about a company using SerpAPI.
         
         Args:
             company_name: Name of the company to search for
             num_results: Number of results to return (default: 5)
+            no_cache: Bypass the response cache
             
         Returns:
             List of news articles with title, snippet, source, and date
         """
+        return self._cached(
+            self._news_key(company_name, num_results),
+            NEWS_CACHE_TTL,
+            no_cache,
+            lambda: self._fetch_company_news(company_name, num_results)
+        )
+    
+    def _fetch_company_news(self, company_name: str, num_results: int) -> List[Dict[str, str]]:
+        """Fetch news from SerpAPI without caching."""
         try:
-            logger.info(f"Fetching news for: {company_name}")
-            
-            # Search query
-            search_query = f"{company_name} latest news"
-            
-            params = {
-                "q": search_query,
-                "api_key": self.api_key,
-                "num": num_results,
-                "tbm": "nws",  # News search
-                "hl": "en",
-                "gl": "us"
-            }
-            
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            
-            news_articles = []
+            logger.info("Fetching news for: %s", company_name)
             
-            if "news_results" in results:
-                for article in results["news_results"][:num_results]:
-                    news_item = {
-                        "title": article.get("title", ""),
-                        "snippet": article.get("snippet", ""),
-                        "source": article.get("link", ""),
-                        "date": article.get("date", ""),
-                        "source_name": article.get("source", {}).get("name", "") if isinstance(article.get("source"), dict) else article.get("source", "")
-                    }
-                    news_articles.append(news_item)
+            results = self._search(self._news_params(company_name, num_results))
+            news_articles = self._parse_news(results, num_results)
             
-            # If no news results, try organic results
-            elif "organic_results" in results:
-                for result in results["organic_results"][:num_results]:
-                    news_item = {
-                        "title": result.get("title", ""),
-                        "snippet": result.get("snippet", ""),
-                        "source": result.get("link", ""),
-                        "date": result.get("date", ""),
-                        "source_name": result.get("displayed_link", "")
-                    }
-                    news_articles.append(news_item)
-            
-            logger.info(f"Found {len(news_articles)} news articles")
+            logger.info("Found %d news articles", len(news_articles))
             return news_articles
             
         except Exception as e:
-            logger.error(f"Error fetching news for {company_name}: {str(e)}")
+            logger.error("Error fetching news for %s: %s", company_name, self._redact(e))
             return []
     
-    def fetch_company_info(self, company_name: str) -> Dict[str, any]:
+    def fetch_company_info(self, company_name: str, no_cache: bool = False) -> Dict[str, any]:
         """
         Fetch general web results about the company.
         
         Args:
             company_name: Name of the company
+            no_cache: Bypass the response cache
             
         Returns:
             Dictionary with search results
         """
+        return self._cached(
+            self._info_key(company_name),
+            INFO_CACHE_TTL,
+            no_cache,
+            lambda: self._fetch_company_info(company_name)
+        )
+    
+    def _fetch_company_info(self, company_name: str) -> Dict[str, any]:
+        """Fetch general web results from SerpAPI without caching."""
         try:
-            logger.info(f"Fetching general info for: {company_name}")
+            logger.info("Fetching general info for: %s", company_name)
+            
+            results = self._search(self._info_params(company_name))
+            return self._parse_info(results)
             
-            params = {
-                "q": company_name,
-                "api_key": self.api_key,
-                "num": 10,
-                "hl": "en",
-                "gl": "us"
-            }
+        except Exception as e:
+            logger.error("Error fetching info for %s: %s", company_name, self._redact(e))
+            return {}
+    
+    async def _fetch_company_news_async(self,
+                                        client: httpx.AsyncClient,
+                                        company_name: str,
+                                        num_results: int) -> List[Dict[str, str]]:
+        """Async variant of _fetch_company_news on a caller-provided client."""
+        try:
+            logger.info("Fetching news for: %s", company_name)
             
-            search = GoogleSearch(params)
-            results = search.get_dict()
+            results = await self._search_async(client, self._news_params(company_name, num_results))
+            news_articles = self._parse_news(results, num_results)
             
-            return {
-                "organic_results": results.get("organic_results", []),
-                "knowledge_graph": results.get("knowledge_graph", {}),
-                "related_searches": results.get("related_searches", [])
-            }
+            logger.info("Found %d news articles", len(news_articles))
+            return news_articles
             
         except Exception as e:
-            logger.error(f"Error fetching info for {company_name}: {str(e)}")
-            return {}
\ No newline at end of file
+            logger.error("Error fetching news for %s: %s", company_name, self._redact(e))
+            return []
+    
+    async def _fetch_company_info_async(self, client: httpx.AsyncClient, company_name: str) -> Dict[str, any]:
+        """Async variant of _fetch_company_info on a caller-provided client."""
+        try:
+            logger.info("Fetching general info for: %s", company_name)
+            
+            results = await self._search_async(client, self._info_params(company_name))
+            return self._parse_info(results)
+            
+        except Exception as e:
+            logger.error("Error fetching info for %s: %s", company_name, self._redact(e))
+            return {}
+    
+    async def fetch_many(self,
+                         company_names: List[str],
+                         num_results: int = 5,
+                         concurrency: int = 8,
+                         no_cache: bool = False) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Fetch news for several companies concurrently.
+        
+        Args:
+            company_names: Names of the companies to search for
+            num_results: Number of results per company (default: 5)
+            concurrency: Maximum number of simultaneous SerpAPI requests
+            no_cache: Bypass the response cache
+            
+        Returns:
+            Mapping of company name to its news articles
+        """
+        sem = asyncio.BoundedSemaphore(concurrency)
+        
+        async def fetch_one(client: httpx.AsyncClient, company_name: str) -> List[Dict[str, str]]:
+            async with sem:
+                return await self._fetch_company_news_async(client, company_name, num_results)
+        
+        async with httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32),
+            timeout=SERPAPI_TIMEOUT
+        ) as client:
+            results = await asyncio.gather(*[
+                self._cached_async(
+                    self._news_key(name, num_results),
+                    NEWS_CACHE_TTL,
+                    no_cache,
+                    lambda name=name: fetch_one(client, name)
+                )
+                for name in company_names
+            ])
+        
+        return dict(zip(company_names, results))
+    
+    def fetch_all(self, company_name: str, num_news: int = 5, no_cache: bool = False) -> Dict[str, any]:
+        """
+        Fetch news and general info about a company in one go.
+        
+        Args:
+            company_name: Name of the company
+            num_news: Number of news articles to return (default: 5)
+            no_cache: Bypass the response cache
+            
+        Returns:
+            Dictionary with the "news" articles and the "info" search results
+        """
+        return asyncio.run(self.fetch_all_async(company_name, num_news, no_cache))
+    
+    async def fetch_all_async(self,
+                              company_name: str,
+                              num_news: int = 5,
+                              no_cache: bool = False) -> Dict[str, any]:
+        """
+        Async variant of fetch_all; the news and info searches run concurrently.
+        
+        Args:
+            company_name: Name of the company
+            num_news: Number of news articles to return (default: 5)
+            no_cache: Bypass the response cache
+            
+        Returns:
+            Dictionary with the "news" articles and the "info" search results
+        """
+        async with httpx.AsyncClient(http2=True, timeout=SERPAPI_TIMEOUT) as client:
+            news, info = await asyncio.gather(
+                self._cached_async(
+                    self._news_key(company_name, num_news),
+                    NEWS_CACHE_TTL,
+                    no_cache,
+                    lambda: self._fetch_company_news_async(client, company_name, num_news)
+                ),
+                self._cached_async(
+                    self._info_key(company_name),
+                    INFO_CACHE_TTL,
+                    no_cache,
+                    lambda: self._fetch_company_info_async(client, company_name)
+                )
+            )
+        
+        return {"news": news, "info": info}
+    
+    def _search(self, params: Dict[str, any]) -> Dict[str, any]:
+        """Run a SerpAPI Google search and return the decoded JSON response."""
+        response = self.session.get(
+            SERPAPI_URL,
+            params={**params, "api_key": self.api_key},
+            timeout=SERPAPI_TIMEOUT
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def _search_async(self, client: httpx.AsyncClient, params: Dict[str, any]) -> Dict[str, any]:
+        """Async variant of _search on a caller-provided client."""
+        response = await client.get(SERPAPI_URL, params={**params, "api_key": self.api_key})
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    def _redact(self, error: Exception) -> str:
+        """Error text with the API key removed (request errors echo the query string)."""
+        return str(error).replace(self.api_key, '***')
+    
+    def _news_params(self, company_name: str, num_results: int) -> Dict[str, any]:
+        """Build SerpAPI parameters for a company news search."""
+        return {
+            "q": f"{company_name} latest news",
+            "num": num_results,
+            "tbm": "nws",  # News search
+            "hl": "en",
+            "gl": "us"
+        }
+    
+    def _info_params(self, company_name: str) -> Dict[str, any]:
+        """Build SerpAPI parameters for a general web search."""
+        return {
+            "q": company_name,
+            "num": 10,
+            "hl": "en",
+            "gl": "us"
+        }
+    
+    def _parse_news(self, results: Dict[str, any], num_results: int) -> List[Dict[str, str]]:
+        """Shape a SerpAPI response into news article dictionaries."""
+        get = dict.get  # local alias keeps attribute lookups out of the loop
+        
+        if "news_results" in results:
+            articles = results["news_results"][:num_results]
+            news_articles = [None] * len(articles)
+            for i, article in enumerate(articles):
+                src = get(article, "source")
+                news_articles[i] = {
+                    "title": get(article, "title", ""),
+                    "snippet": get(article, "snippet", ""),
+                    "source": get(article, "link", ""),
+                    "date": get(article, "date", ""),
+                    "source_name": src.get("name", "") if type(src) is dict else (src or "")
+                }
+        
+        # If no news results, try organic results
+        elif "organic_results" in results:
+            organic = results["organic_results"][:num_results]
+            news_articles = [None] * len(organic)
+            for i, result in enumerate(organic):
+                news_articles[i] = {
+                    "title": get(result, "title", ""),
+                    "snippet": get(result, "snippet", ""),
+                    "source": get(result, "link", ""),
+                    "date": get(result, "date", ""),
+                    "source_name": get(result, "displayed_link", "")
+                }
+        
+        else:
+            news_articles = []
+        
+        return news_articles
+    
+    def _parse_info(self, results: Dict[str, any]) -> Dict[str, any]:
+        """Keep the parts of a general SerpAPI response the agent uses."""
+        return {
+            "organic_results": results.get("organic_results", []),
+            "knowledge_graph": results.get("knowledge_graph", {}),
+            "related_searches": results.get("related_searches", [])
+        }
+    
+    def _cached(self, key: str, ttl: int, no_cache: bool, fetch: Callable[[], Any]) -> Any:
+        """Return a cached response for key, fetching and storing it on a miss."""
+        cache_key = self._cache_key(key)
+        
+        if not no_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("Cache hit for %s", key)
+                return cached
+        
+        result = fetch()
+        
+        # Empty results are what the fetchers return on errors; don't cache those
+        if result:
+            self._cache_set(cache_key, result, ttl)
+        
+        return result
+    
+    async def _cached_async(self,
+                            key: str,
+                            ttl: int,
+                            no_cache: bool,
+                            fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of _cached; fetch returns a fresh coroutine on each call."""
+        cache_key = self._cache_key(key)
+        
+        if not no_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("Cache hit for %s", key)
+                return cached
+        
+        result = await fetch()
+        
+        if result:
+            self._cache_set(cache_key, result, ttl)
+        
+        return result
+    
+    def _cache_get(self, cache_key: str) -> Any:
+        """Read a cached response, or None on a miss."""
+        raw = self.cache.get(cache_key)
+        return orjson.loads(raw) if raw is not None else None
+    
+    def _cache_set(self, cache_key: str, value: Any, ttl: int):
+        """Store a response as raw orjson bytes."""
+        self.cache.set(cache_key, orjson.dumps(value), expire=ttl)
+    
+    def _news_key(self, company_name: str, num_results: int) -> str:
+        """Readable cache key for a company news search."""
+        return f"news|{self._normalize_name(company_name)}|{num_results}"
+    
+    def _info_key(self, company_name: str) -> str:
+        """Readable cache key for a general web search."""
+        return f"info|{self._normalize_name(company_name)}|10"
+    
+    def _cache_key(self, key: str) -> str:
+        """Hash a readable cache key into a fixed-length one."""
+        return hashlib.sha1(key.encode()).hexdigest()
+    
+    def _normalize_name(self, company_name: str) -> str:
+        """Normalize a company name so trivially different spellings share a cache entry."""
+        return " ".join(company_name.lower().split())
\ No newline at end of file
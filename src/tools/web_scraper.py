@@ -1,19 +1,131 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional
+import asyncio
+import hashlib
+import aiohttp
+import diskcache
+import httpx
+import orjson
+from selectolax.lexbor import LexborHTMLParser
+from typing import Dict, List, Optional, Tuple, Union
 import logging
 from urllib.parse import urljoin, urlparse
 import time
+import os
+from importlib.util import find_spec
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 logger = logging.getLogger(__name__)
 
+# Subtrees that carry no extractable content; removed right after parsing
+NON_CONTENT_TAGS = ['script', 'style', 'noscript', 'svg', 'template', 'iframe']
+
+# Shared, read-only request headers; only copied when the user agent is overridden
+_DEFAULT_HEADERS = MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml'
+})
+
+# Selectors for the fields pulled out of every page
+TITLE_SELECTOR = 'title'
+META_DESCRIPTION_SELECTOR = 'meta[name="description"]'
+HEADING_SELECTOR = 'h1, h2'
+LINK_SELECTOR = 'a[href]'
+
+# Text-bearing blocks that make up a page's main content; containers are safe
+# to include because blocks nested in an emitted block are skipped
+CONTENT_SELECTOR = 'main, article, section, p, h1, h2, h3, li'
+MAX_CONTENT_CHARS = 5000
+# Below this, the blocks missed the page's copy (e.g. div-built pages with only
+# a nav list), so the whole body text is used instead
+MIN_CONTENT_CHARS = 200
+
+MAX_OUTBOUND_LINKS = 20
+
+# Only advertise encodings httpx can decode with the packages actually installed
+ACCEPT_ENCODING = ', '.join(
+    ['gzip', 'deflate']
+    + (['br'] if find_spec('brotli') or find_spec('brotlicffi') else [])
+    + (['zstd'] if find_spec('zstandard') else [])
+)
+
+# Responses retried with exponential backoff (httpx itself only retries connect errors)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Downloads are streamed and cut off here so huge responses can't exhaust memory
+MAX_DOWNLOAD_BYTES = 3 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Parsed pages are kept for a day and revalidated with conditional GETs
+PAGE_CACHE_TTL = 86400
+
+# Bodies handed to worker processes are trimmed to bound pickling/IPC cost
+MAX_PARSE_BYTES = 2_000_000
+
+
+class _RetryTransport(httpx.BaseTransport):
+    """Transport wrapper retrying RETRY_STATUSES responses with exponential backoff."""
+    
+    def __init__(self, transport: httpx.BaseTransport, retries: int = 3, backoff_factor: float = 0.3):
+        self.transport = transport
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+    
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.retries):
+            response = self.transport.handle_request(request)
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            
+            retry_after = response.headers.get('Retry-After', '')
+            # Capped so a long Retry-After can't stall a scrape indefinitely
+            delay = min(int(retry_after), 30) if retry_after.isdigit() else self.backoff_factor * 2 ** attempt
+            response.close()
+            time.sleep(delay)
+        
+        return self.transport.handle_request(request)
+    
+    def close(self):
+        self.transport.close()
+
 
 class WebScraper:
-    def __init__(self, timeout: int = 30, user_agent: Optional[str] = None):
+    def __init__(self,
+                 timeout: int = 30,
+                 user_agent: Optional[str] = None,
+                 cache_dir: Optional[str] = None):
         self.timeout = timeout
-        self.headers = {
-            'User-Agent': user_agent or 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        self.headers = _DEFAULT_HEADERS
+        if user_agent:
+            self.headers = MappingProxyType({**_DEFAULT_HEADERS, 'User-Agent': user_agent})
+        # Reuse HTTP/2 connections across scrapes instead of reconnecting per request
+        transport = _RetryTransport(httpx.HTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+            retries=3
+        ))
+        self.client = httpx.Client(
+            transport=transport,
+            headers={'Accept-Encoding': ACCEPT_ENCODING, **self.headers},
+            timeout=timeout,
+            follow_redirects=True
+        )
+        
+        # Disk-backed so unchanged pages skip the download and the parser across runs
+        self.cache = diskcache.Cache(
+            cache_dir or os.getenv('WEBSCRAPER_CACHE_DIR', '.cache/webscraper'),
+            size_limit=500_000_000
+        )
+    
+    def close(self):
+        """Close the underlying HTTP client and page cache."""
+        self.client.close()
+        self.cache.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def scrape_website(self, url: str) -> Dict[str, any]:
         """
@@ -26,79 +138,303 @@ class WebScraper:
             Dictionary containing scraped data
         """
         try:
-            logger.info(f"Scraping website: {url}")
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
+            logger.info("Scraping website: %s", url)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            cache_key = hashlib.sha1(url.encode()).hexdigest()
+            raw = self.cache.get(cache_key)
+            entry = orjson.loads(raw) if raw is not None else None
             
-            # Extract page title
-            title = soup.find('title')
-            title_text = title.text.strip() if title else ''
+            # Revalidate the cached copy instead of downloading it again
+            validators = {}
+            if entry:
+                if entry['etag']:
+                    validators['If-None-Match'] = entry['etag']
+                if entry['last_modified']:
+                    validators['If-Modified-Since'] = entry['last_modified']
             
-            # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            meta_description = meta_desc.get('content', '') if meta_desc else ''
+            response, body = self._fetch_page(url, validators)
+            if entry and response.status_code == 304:
+                logger.info("Page not modified: %s", url)
+                # Report when this scrape happened, not when the page was first parsed
+                return {**entry['parsed'], 'scraped_at': time.time()}
             
-            # Extract H1 and H2 tags
-            h1_tags = [h1.text.strip() for h1 in soup.find_all('h1')]
-            h2_tags = [h2.text.strip() for h2 in soup.find_all('h2')]
+            # Servers without validators may still send identical bytes
+            digest = hashlib.sha1(body).hexdigest()
+            if entry and entry['hash'] == digest:
+                parsed = {**entry['parsed'], 'scraped_at': time.time()}
+            else:
+                parsed = _parse_html(body, url)
             
-            # Extract outbound links
-            outbound_links = self._extract_outbound_links(soup, url)
+            self.cache.set(cache_key, orjson.dumps({
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'hash': digest,
+                'parsed': parsed
+            }), expire=PAGE_CACHE_TTL)
             
-            # Extract main content (simplified version)
-            content = self._extract_content(soup)
+            return parsed
             
-            return {
-                'url': url,
-                'title': title_text,
-                'meta_description': meta_description,
-                'h1_tags': h1_tags,
-                'h2_tags': h2_tags,
-                'outbound_links': outbound_links[:20],  # Limit to 20 links
-                'content': content[:5000],  # Limit content length
-                'scraped_at': time.time()
-            }
-            
-        except requests.RequestException as e:
-            logger.error(f"Error scraping {url}: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Error scraping %s: %s", url, e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error scraping {url}: {str(e)}")
+            logger.error("Unexpected error scraping %s: %s", url, e)
             raise
     
-    def _extract_outbound_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        """Extract outbound links from the page."""
-        outbound_links = []
-        base_domain = urlparse(base_url).netloc
+    async def scrape_website_async(self, url: str) -> Dict[str, any]:
+        """
+        Async variant of scrape_website.
         
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            absolute_url = urljoin(base_url, href)
+        Runs scrape_website in a worker thread so the async path shares its
+        pooled client, download cap, content-type check and page cache.
+        
+        Args:
+            url: The URL to scrape
+            
+        Returns:
+            Dictionary containing scraped data
+        """
+        return await asyncio.to_thread(self.scrape_website, url)
+    
+    async def scrape_many(self,
+                          urls: List[str],
+                          concurrency: int = 32) -> List[Union[Dict[str, any], Exception]]:
+        """
+        Scrape many websites concurrently.
+        
+        Pages are fetched with a shared aiohttp session, with at most
+        `concurrency` requests in flight, and parsed in a process pool.
+        
+        Args:
+            urls: The URLs to scrape
+            concurrency: Maximum number of simultaneous requests
             
-            # Check if it's an outbound link
-            if urlparse(absolute_url).netloc != base_domain:
-                outbound_links.append(absolute_url)
+        Returns:
+            Scraped data per URL, in input order; failed URLs hold the exception
+        """
+        sem = asyncio.BoundedSemaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit_per_host=8, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers, timeout=timeout) as session:
+            bodies = await asyncio.gather(
+                *[self._fetch(session, url, sem) for url in urls],
+                return_exceptions=True
+            )
+        
+        # Parsing is CPU-bound, so run it outside the event loop and the GIL
+        loop = asyncio.get_running_loop()
+        results: List[Union[Dict[str, any], Exception]] = list(bodies)
+        with ProcessPoolExecutor() as pool:
+            parsed = {
+                i: loop.run_in_executor(pool, _parse_html, body[:MAX_PARSE_BYTES], url)
+                for i, (url, body) in enumerate(zip(urls, bodies))
+                if not isinstance(body, Exception)
+            }
+            for i, result in zip(parsed, await asyncio.gather(*parsed.values(), return_exceptions=True)):
+                results[i] = result
+        
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.error("Error scraping %s: %s", url, result)
         
-        return list(set(outbound_links))  # Remove duplicates
+        return results
     
-    def _extract_content(self, soup: BeautifulSoup) -> str:
-        """Extract main textual content from the page."""
-        # Remove script and style elements
-        for script in soup(['script', 'style']):
-            script.decompose()
+    def scrape_website_parallel(self, urls: List[str]) -> List[Union[Dict[str, any], Exception]]:
+        """
+        Scrape many websites using threads for fetching and processes for parsing.
         
-        # Get text
-        text = soup.get_text()
+        Args:
+            urls: The URLs to scrape
+            
+        Returns:
+            Scraped data per URL, in input order; failed URLs hold the exception
+        """
+        results: List[Union[Dict[str, any], Exception]] = [None] * len(urls)
         
-        # Break into lines and remove leading/trailing space
-        lines = (line.strip() for line in text.splitlines())
+        with ThreadPoolExecutor(max_workers=min(32, len(urls) or 1)) as fetchers, \
+                ProcessPoolExecutor(max_workers=os.cpu_count()) as parsers:
+            fetches = {fetchers.submit(self._fetch_body, url): i for i, url in enumerate(urls)}
+            parses = {}
+            
+            # Start parsing each page as soon as its body arrives
+            for future in as_completed(fetches):
+                i = fetches[future]
+                try:
+                    body = future.result()
+                except Exception as e:
+                    logger.error("Error scraping %s: %s", urls[i], e)
+                    results[i] = e
+                    continue
+                parses[parsers.submit(_parse_html, body[:MAX_PARSE_BYTES], urls[i])] = i
+            
+            for future in as_completed(parses):
+                i = parses[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    logger.error("Unexpected error scraping %s: %s", urls[i], e)
+                    results[i] = e
         
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        return results
+    
+    def _fetch_body(self, url: str) -> bytes:
+        """Fetch a page body with the pooled client."""
+        return self._fetch_page(url)[1]
+    
+    def _fetch_page(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[httpx.Response, bytes]:
+        """
+        Fetch a page with the pooled client, returning the response and its body.
         
-        # Drop blank lines
-        text = ' '.join(chunk for chunk in chunks if chunk)
+        The body is streamed and capped at MAX_DOWNLOAD_BYTES; non-HTML
+        and 304 Not Modified responses yield an empty body.
+        """
+        with self.client.stream('GET', url, headers=headers) as response:
+            if response.status_code == 304:
+                return response, b''
+            response.raise_for_status()
+            
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and 'html' not in content_type:
+                logger.info("Skipping non-HTML response from %s (%s)", url, content_type)
+                return response, b''
+            
+            body = bytearray()
+            for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                body.extend(chunk)
+                if len(body) >= MAX_DOWNLOAD_BYTES:
+                    break
+            
+            return response, bytes(body[:MAX_DOWNLOAD_BYTES])
+    
+    async def _fetch(self, session: aiohttp.ClientSession, url: str, sem: asyncio.BoundedSemaphore) -> bytes:
+        """
+        Fetch a page body, holding the semaphore for the duration of the request.
         
-        return text
\ No newline at end of file
+        Like _fetch_page, the body is capped at MAX_DOWNLOAD_BYTES and
+        non-HTML responses yield an empty body.
+        """
+        async with sem, session.get(url) as response:
+            response.raise_for_status()
+            
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and 'html' not in content_type:
+                logger.info("Skipping non-HTML response from %s (%s)", url, content_type)
+                return b''
+            
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                body.extend(chunk)
+                if len(body) >= MAX_DOWNLOAD_BYTES:
+                    break
+            
+            return bytes(body[:MAX_DOWNLOAD_BYTES])
+
+
+def _parse_html(body: bytes, url: str) -> Dict[str, any]:
+    """
+    Parse a raw HTML body into the scraped data dictionary.
+    
+    Kept at module level (no self) so it can be pickled and run in a
+    worker process.
+    """
+    tree = LexborHTMLParser(body)
+    tree.strip_tags(NON_CONTENT_TAGS)
+    
+    # Extract page title
+    title = tree.css_first(TITLE_SELECTOR)
+    title_text = title.text().strip() if title else ''
+    
+    # Extract meta description
+    meta_desc = tree.css_first(META_DESCRIPTION_SELECTOR)
+    meta_description = (meta_desc.attributes.get('content') or '') if meta_desc else ''
+    
+    # Extract H1 and H2 tags in a single traversal
+    h1_tags = []
+    h2_tags = []
+    for heading in tree.css(HEADING_SELECTOR):
+        (h1_tags if heading.tag == 'h1' else h2_tags).append(heading.text().strip())
+    
+    # Extract outbound links
+    outbound_links = _extract_outbound_links(tree, url)
+    
+    # Extract main content (simplified version)
+    content = _extract_content(tree)
+    
+    return {
+        'url': url,
+        'title': title_text,
+        'meta_description': meta_description,
+        'h1_tags': h1_tags,
+        'h2_tags': h2_tags,
+        'outbound_links': outbound_links,
+        'content': content,
+        'scraped_at': time.time()
+    }
+
+
+def _extract_outbound_links(tree: LexborHTMLParser,
+                            base_url: str,
+                            max_links: int = MAX_OUTBOUND_LINKS) -> List[str]:
+    """Extract up to max_links unique outbound links from the page."""
+    seen = {}  # dict rather than set to keep document order
+    # Schemes and hosts are case-insensitive, so compare them lowercased
+    base_domain = urlparse(base_url).netloc.lower()
+    # Most links point back at this site; reject those by prefix before parsing
+    internal_prefixes = tuple(
+        f'{scheme}://{base_domain}{sep}' for scheme in ('https', 'http') for sep in '/?#'
+    )
+    
+    for link in tree.css(LINK_SELECTOR):
+        href = (link.attributes.get('href') or '').strip()
+        
+        if href[:8].lower().startswith(('http://', 'https://')):
+            absolute_url = href
+        elif href.startswith('//'):
+            absolute_url = urljoin(base_url, href)
+        else:
+            # Relative paths stay on this site; fragments, mailto:,
+            # javascript: and similar aren't web links at all
+            continue
+        
+        # Check if it's an outbound link
+        if absolute_url.lower().startswith(internal_prefixes):
+            continue
+        if urlparse(absolute_url).netloc.lower() != base_domain:
+            seen[absolute_url] = None
+            if len(seen) >= max_links:
+                break
+    
+    return list(seen)
+
+
+def _extract_content(tree: LexborHTMLParser, max_chars: int = MAX_CONTENT_CHARS) -> str:
+    """Extract main textual content from the page, stopping once max_chars is reached."""
+    # Walk text-bearing blocks in document order instead of materializing the
+    # whole page's text (non-content tags were stripped in _parse_html)
+    parts = []
+    total = 0
+    emitted = set()  # mem_ids of blocks whose text (descendants included) is already in parts
+    for node in tree.css(CONTENT_SELECTOR):
+        # Blocks nested in an emitted block (li > p, nested menus) were already covered
+        parent = node.parent
+        while parent is not None and parent.mem_id not in emitted:
+            parent = parent.parent
+        if parent is not None:
+            continue
+        emitted.add(node.mem_id)
+        
+        text = ' '.join(node.text(separator=' ').split())
+        if not text:
+            continue
+        parts.append(text)
+        total += len(text) + 1
+        if total >= max_chars:
+            break
+    
+    # Pages built purely from divs have few or none of those blocks; fall back to all text
+    if total < MIN_CONTENT_CHARS:
+        root = tree.body or tree.root
+        parts = (root.text(separator=' ') if root else '').split()
+    
+    return ' '.join(parts)[:max_chars]
\ No newline at end of file
@@ -1,18 +1,59 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 
+# Background listener that writes queued records to the real handlers
+_listener: Optional[QueueListener] = None
 
-def setup_logging():
-    """Configure logging for the application."""
+
+class _LazyRotatingFileHandler(logging.Handler):
+    """Rotating file handler that only creates the log file on the first record."""
+    
+    def __init__(self, filename: str, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.filename = filename
+        self._handler: Optional[RotatingFileHandler] = None
+    
+    def emit(self, record: logging.LogRecord):
+        # Failures must not escape: they would kill the QueueListener thread
+        try:
+            if self._handler is None:
+                Path(self.filename).parent.mkdir(parents=True, exist_ok=True)
+                self._handler = RotatingFileHandler(
+                    self.filename,
+                    maxBytes=10 * 1024 * 1024,  # 10MB
+                    backupCount=5
+                )
+                self._handler.setFormatter(self.formatter)
+            self._handler.emit(record)
+        except Exception:
+            self.handleError(record)
     
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    def close(self):
+        if self._handler is not None:
+            self._handler.close()
+        super().close()
+
+
+def setup_logging() -> QueueListener:
+    """
+    Configure logging for the application.
     
-    # Get log level from environment or default to INFO
-    log_level = os.getenv("LOG_LEVEL", "INFO")
+    Application threads only enqueue records; a background QueueListener does
+    the file and console I/O. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+    
+    # Get log level from environment or default to INFO; resolved to an int once
+    log_level = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+    if not isinstance(log_level, int):
+        log_level = logging.INFO
     log_file = os.getenv("LOG_FILE", "logs/app.log")
     
     # Create formatter
@@ -21,12 +62,9 @@ def setup_logging():
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    # Set up file handler with rotation
-    file_handler = RotatingFileHandler(
-        log_file,
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
-    )
+    # Set up file handler with rotation; the logs directory and file are
+    # only created once something is actually logged
+    file_handler = _LazyRotatingFileHandler(log_file)
     file_handler.setFormatter(formatter)
     file_handler.setLevel(log_level)
     
@@ -35,13 +73,19 @@ def setup_logging():
     console_handler.setFormatter(formatter)
     console_handler.setLevel(log_level)
     
-    # Configure root logger
+    # Configure root logger to hand records off to the listener thread
+    log_queue = queue.Queue(-1)
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(QueueHandler(log_queue))
+    
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
     
     # Reduce noise from third-party libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("requests").setLevel(logging.WARNING)
-    logging.getLogger("httpx").setLevel(logging.WARNING)
\ No newline at end of file
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    
+    return _listener
\ No newline at end of file
@@ -0,0 +1,16 @@
+import pytest
+
+from src.tools.gemini_analyzer import GeminiAnalyzer
+
+
+def test_analyzer_constructs_with_response_schema():
+    analyzer = GeminiAnalyzer(api_key="x")
+    
+    assert analyzer.model is not None
+
+
+def test_analyzer_requires_api_key(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    
+    with pytest.raises(ValueError):
+        GeminiAnalyzer()
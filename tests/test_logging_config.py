@@ -0,0 +1,30 @@
+import logging
+
+from src.utils.logging_config import _LazyRotatingFileHandler
+
+
+def test_lazy_file_handler_creates_file_on_first_record(tmp_path):
+    log_file = tmp_path / "logs" / "app.log"
+    handler = _LazyRotatingFileHandler(str(log_file))
+    
+    assert not log_file.parent.exists()
+    
+    handler.handle(logging.makeLogRecord({"msg": "hello"}))
+    handler.close()
+    
+    assert "hello" in log_file.read_text()
+
+
+def test_lazy_file_handler_reports_setup_failure_instead_of_raising(tmp_path, monkeypatch):
+    # A file where a directory is expected makes the lazy mkdir fail
+    blocker = tmp_path / "notadir"
+    blocker.write_text("")
+    handler = _LazyRotatingFileHandler(str(blocker / "sub" / "app.log"))
+    
+    errors = []
+    monkeypatch.setattr(handler, "handleError", errors.append)
+    
+    record = logging.makeLogRecord({"msg": "hello"})
+    handler.handle(record)
+    
+    assert errors == [record]
@@ -0,0 +1,51 @@
+import asyncio
+
+from src.tools.news_fetcher import NewsFetcher
+
+
+def make_fetcher(tmp_path, responses) -> NewsFetcher:
+    fetcher = NewsFetcher(api_key="test-key", cache_dir=str(tmp_path / "cache"))
+    fetcher.searches = []
+    
+    async def search_async(client, params):
+        fetcher.searches.append(params["q"])
+        result = responses(params)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    fetcher._search_async = search_async
+    return fetcher
+
+
+def news_response(params):
+    return {"news_results": [{"title": params["q"], "source": {"name": "Wire"}}]}
+
+
+def test_fetch_many_uses_cache_unless_bypassed(tmp_path):
+    fetcher = make_fetcher(tmp_path, news_response)
+    
+    first = asyncio.run(fetcher.fetch_many(["Acme", "Globex"]))
+    second = asyncio.run(fetcher.fetch_many(["acme", "Globex"]))
+    assert len(fetcher.searches) == 2
+    assert second["acme"] == first["Acme"]
+    
+    asyncio.run(fetcher.fetch_many(["Acme"], no_cache=True))
+    assert len(fetcher.searches) == 3
+
+
+def test_fetch_all_runs_both_searches_and_skips_caching_errors(tmp_path):
+    def responses(params):
+        if params.get("tbm") == "nws":
+            return news_response(params)
+        return RuntimeError("boom test-key")
+    
+    fetcher = make_fetcher(tmp_path, responses)
+    
+    result = fetcher.fetch_all("Acme")
+    assert result["news"][0]["source_name"] == "Wire"
+    assert result["info"] == {}
+    
+    # News comes from the cache; the failed info search is retried
+    fetcher.fetch_all("Acme")
+    assert fetcher.searches == ["Acme latest news", "Acme", "Acme"]
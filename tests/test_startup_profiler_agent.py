@@ -0,0 +1,38 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.agents.startup_profiler_agent import StartupProfilerAgent
+
+
+def make_agent(calls) -> StartupProfilerAgent:
+    agent = object.__new__(StartupProfilerAgent)
+    agent.db_manager = SimpleNamespace(
+        check_company_exists=lambda url: True,
+        get_company_profile_summary=lambda url: {"id": "1", "company_name": "Acme"}
+    )
+    agent.web_scraper = SimpleNamespace(
+        scrape_website=lambda url: calls.append("scrape"),
+        scrape_website_async=lambda url: calls.append("scrape")
+    )
+    agent.news_fetcher = SimpleNamespace(fetch_company_news=lambda name: calls.append("news"))
+    return agent
+
+
+def test_existing_profile_skips_scrape_and_news():
+    calls = []
+    
+    result = make_agent(calls).profile_company("https://acme.com")
+    
+    assert result["status"] == "exists"
+    assert result["data"]["company_name"] == "Acme"
+    assert calls == []
+
+
+def test_async_existing_profile_skips_scrape_and_news():
+    calls = []
+    
+    result = asyncio.run(make_agent(calls).profile_company_async("https://acme.com"))
+    
+    assert result["status"] == "exists"
+    assert result["data"]["company_name"] == "Acme"
+    assert calls == []
@@ -0,0 +1,154 @@
+import asyncio
+
+import httpx
+
+from src.tools import web_scraper
+from src.tools.web_scraper import WebScraper
+
+
+def make_scraper(tmp_path, handler) -> WebScraper:
+    scraper = WebScraper(cache_dir=str(tmp_path / "cache"))
+    scraper.client = httpx.Client(transport=httpx.MockTransport(handler))
+    return scraper
+
+
+def test_async_scrape_truncates_oversized_body(tmp_path, monkeypatch):
+    monkeypatch.setattr(web_scraper, "MAX_DOWNLOAD_BYTES", 1024)
+    monkeypatch.setattr(web_scraper, "DOWNLOAD_CHUNK_SIZE", 256)
+    
+    parsed_sizes = []
+    parse_html = web_scraper._parse_html
+    
+    def spy(body, url):
+        parsed_sizes.append(len(body))
+        return parse_html(body, url)
+    
+    monkeypatch.setattr(web_scraper, "_parse_html", spy)
+    
+    body = b"<html><title>Big</title><body><p>" + b"a" * 10_000 + b"</p></body></html>"
+    scraper = make_scraper(
+        tmp_path,
+        lambda request: httpx.Response(200, headers={"Content-Type": "text/html"}, content=body)
+    )
+    
+    result = asyncio.run(scraper.scrape_website_async("https://example.com"))
+    
+    assert result["title"] == "Big"
+    assert parsed_sizes == [1024]
+
+
+def test_async_scrape_skips_non_html(tmp_path):
+    scraper = make_scraper(
+        tmp_path,
+        lambda request: httpx.Response(200, headers={"Content-Type": "application/pdf"}, content=b"%PDF")
+    )
+    
+    result = asyncio.run(scraper.scrape_website_async("https://example.com/file.pdf"))
+    
+    assert result["title"] == ""
+    assert result["content"] == ""
+
+
+def test_outbound_links_ignore_same_site_query_and_fragment_links():
+    body = (
+        b'<a href="https://ex.com?x=1">query</a>'
+        b'<a href="https://ex.com#top">fragment</a>'
+        b'<a href="https://ex.com">bare</a>'
+        b'<a href="//ex.com/about">protocol-relative</a>'
+        b'<a href="https://other.com?ref=ex">other</a>'
+        b'<a href="https://other.com?ref=ex">duplicate</a>'
+    )
+    
+    result = web_scraper._parse_html(body, "https://ex.com/")
+    
+    assert result["outbound_links"] == ["https://other.com?ref=ex"]
+
+
+def test_content_does_not_repeat_nested_blocks():
+    body = (
+        b"<ul><li>menu<ul><li>nested</li></ul></li></ul>"
+        b"<ul><li><p>item text</p></li></ul>"
+        b"<p>after</p>"
+    )
+    
+    result = web_scraper._parse_html(body, "https://ex.com/")
+    
+    assert result["content"] == "menu nested item text after"
+
+
+def test_retry_transport_retries_transient_statuses(monkeypatch):
+    monkeypatch.setattr(web_scraper.time, "sleep", lambda seconds: None)
+    statuses = iter([503, 429, 200])
+    transport = web_scraper._RetryTransport(
+        httpx.MockTransport(lambda request: httpx.Response(next(statuses)))
+    )
+    
+    with httpx.Client(transport=transport) as client:
+        assert client.get("https://example.com").status_code == 200
+
+
+def test_retry_transport_gives_up_after_retries(monkeypatch):
+    monkeypatch.setattr(web_scraper.time, "sleep", lambda seconds: None)
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(502)
+    
+    transport = web_scraper._RetryTransport(httpx.MockTransport(handler), retries=3)
+    
+    with httpx.Client(transport=transport) as client:
+        assert client.get("https://example.com").status_code == 502
+    assert len(calls) == 4
+
+
+def test_cached_scrape_reports_current_scrape_time(tmp_path, monkeypatch):
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "text/html", "ETag": '"v1"'},
+            content=b"<title>Cached</title>"
+        )
+    
+    scraper = make_scraper(tmp_path, handler)
+    
+    monkeypatch.setattr(web_scraper.time, "time", lambda: 1000.0)
+    first = scraper.scrape_website("https://example.com")
+    
+    monkeypatch.setattr(web_scraper.time, "time", lambda: 2000.0)
+    second = scraper.scrape_website("https://example.com")
+    
+    assert first["scraped_at"] == 1000.0
+    assert second["title"] == "Cached"
+    assert second["scraped_at"] == 2000.0
+
+
+def test_content_falls_back_to_body_text_when_blocks_are_sparse():
+    body = b"<div>Hero text</div><nav><ul><li>Home</li></ul></nav>"
+    
+    result = web_scraper._parse_html(body, "https://ex.com/")
+    
+    assert result["content"] == "Hero text Home"
+
+
+def test_content_reads_container_blocks_once():
+    copy = "Real marketing copy. " * 20
+    body = f"<main><div>{copy}</div><p>Closing line</p></main><ul><li>Footer</li></ul>".encode()
+    
+    result = web_scraper._parse_html(body, "https://ex.com/")
+    
+    assert result["content"] == " ".join(copy.split()) + " Closing line Footer"
+
+
+def test_outbound_links_compare_scheme_and_host_case_insensitively():
+    body = (
+        b'<a href="HTTPS://Other.com/x">upper scheme</a>'
+        b'<a href="Https://EX.com/about">same site</a>'
+        b'<a href="http://EX.COM?x=1">same site query</a>'
+    )
+    
+    result = web_scraper._parse_html(body, "https://Ex.com/")
+    
+    assert result["outbound_links"] == ["HTTPS://Other.com/x"]